@@ -1,13 +1,17 @@
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-from django.utils.translation import ugettext, ugettext_lazy, ungettext_lazy
+from django.utils.translation import ugettext, ugettext_lazy, ungettext, \
+    ungettext_lazy
 
 import openpay
 
 default_app_config = 'django_openpay.apps.DjangoOpenpayConfig'
+# Set by start() from the OPENPAY_ASYNC_COMMIT setting
+async_commit = False
 
 
 def start():
+    global async_commit
     OPENPAY_PRIVATE_API_KEY = getattr(
         settings, 'OPENPAY_PRIVATE_API_KEY', None)
     OPENPAY_VERIFY_SSL = getattr(settings, 'OPENPAY_VERIFY_SSL', None)
@@ -18,6 +22,7 @@ def start():
     #     settings, 'OPENPAY_BASICAUTH_USERS', None)
     OPENPAY_CUSTOMER_MODEL = getattr(
         settings, 'OPENPAY_CUSTOMER_MODEL', None)
+    OPENPAY_ASYNC_COMMIT = getattr(settings, 'OPENPAY_ASYNC_COMMIT', False)
 
     if not OPENPAY_PRIVATE_API_KEY:
         raise ImproperlyConfigured(
@@ -48,11 +53,16 @@ def start():
         raise ImproperlyConfigured(
             "OPENPAY_CUSTOMER_MODEL must be defined. (String)"
         )
+    if OPENPAY_ASYNC_COMMIT not in [True, False]:
+        raise ImproperlyConfigured(
+            "OPENPAY_ASYNC_COMMIT must be a Boolean, if defined. (Boolean)"
+        )
 
     openpay.api_key = OPENPAY_PRIVATE_API_KEY
     openpay.verify_ssl_certs = OPENPAY_VERIFY_SSL
     openpay.merchant_id = OPENPAY_MERCHANT_ID
     openpay.device_id = OPENPAY_DEVICE_ID
     openpay.production = not DEBUG
+    async_commit = OPENPAY_ASYNC_COMMIT
 
 start()
@@ -1,19 +1,101 @@
-from django.contrib import admin
-from . import models, ugettext
+from django.contrib import admin, messages
+from django.core.exceptions import ObjectDoesNotExist
+
+from itertools import groupby
+
+from . import models, openpay, exceptions, ugettext, ungettext, \
+    async_commit
 from .utils import get_customer_model
 
 CustomerModel = get_customer_model()
 
 
+def load_charges(queryset):
+    # Pull the Openpay charges grouped by customer, so every customer is
+    # retrieved only once instead of once per charge.
+    queryset = queryset.select_related('customer', 'card').order_by(
+        'customer__openpay_id')
+    for customer_id, charges in groupby(
+            queryset, key=lambda charge: charge.customer.openpay_id):
+        op_customer = None
+        if customer_id:
+            try:
+                op_customer = openpay.Customer.retrieve(customer_id)
+            except openpay.error.InvalidRequestError:
+                # e.g. a deleted customer, its charges use their own op_load
+                pass
+        for charge in charges:
+            if op_customer and charge.openpay_id:
+                try:
+                    charge._op_ = op_customer.charges.retrieve(
+                        charge.openpay_id)
+                except openpay.error.InvalidRequestError:
+                    # Let the charge fall back to its own op_load
+                    pass
+            yield charge
+
+
+def enqueue_charges(queryset, task_name):
+    # Let the Celery workers call Openpay in parallel, one task per charge
+    from celery import group
+    from . import tasks
+    task = getattr(tasks, task_name)
+    pks = list(queryset.values_list('pk', flat=True))
+    group(task.s(pk) for pk in pks).delay()
+    return len(pks)
+
+
+def process_charges(queryset, operation, fields=models.Charge.op_fill_fields,
+                    **kwargs):
+    # Call the operation (e.g. 'op_capture') of every charge and fill them
+    # with the Openpay response. The processed charges are stored even when
+    # another charge fails, the failed ones are returned to be reported.
+    processed = []
+    failed = []
+    try:
+        for charge in load_charges(queryset):
+            try:
+                getattr(charge, operation)(**kwargs)
+            except (exceptions.DjangoOpenpayError,
+                    openpay.error.OpenpayError):
+                failed.append(charge)
+                continue
+            try:
+                charge.op_fill()
+            except ObjectDoesNotExist:
+                # Processed in Openpay, but a related object is missing here
+                failed.append(charge)
+                continue
+            processed.append(charge)
+    finally:
+        models.Charge.op_bulk_save(processed, fields)
+    return processed, failed
+
+
+class CustomerAdmin(admin.ModelAdmin):
+    # The customer model is defined by each project (OPENPAY_CUSTOMER_MODEL),
+    # so this admin is not registered here. Register or extend it with:
+    # admin.site.register(CustomerModel, CustomerAdmin)
+    list_display = ('pk', 'openpay_id', 'first_name', 'last_name', 'email',
+                    'creation_date')
+    search_fields = ('openpay_id', 'first_name', 'last_name', 'email')
+    raw_id_fields = ('address', )
+    readonly_fields = CustomerModel.get_readonly_fields()
+
+    def get_queryset(self, request):
+        # Load the cards and subscriptions of all the customers at once, for
+        # the inlines or columns that use them
+        return super().get_queryset(request).prefetch_related(
+            'cards', 'subscriptions')
+
+
 # Register your models here.
 @admin.register(models.Address)
 class AddressAdmin(admin.ModelAdmin):
     model = models.Address
     list_display = ('line1', 'line2', 'line3', 'city', 'state',
                     'country_code', 'postal_code')
-
-    def get_readonly_fields(self, request, obj=None):
-        return models.Address.get_readonly_fields(obj)
+    readonly_fields = models.Address.get_readonly_fields()
 
 
 @admin.register(models.Card)
@@ -22,42 +104,31 @@ class CardAdmin(admin.ModelAdmin):
     actions = ['refresh', 'dismiss', ]
     list_display = ('pk', 'openpay_id', 'alias', 'holder', 'customer',
                     'creation_date')
+    list_select_related = ('customer', )
+    readonly_fields = models.Card.get_readonly_fields()
 
     def refresh(self, request, queryset):
-        refreshed = 0
         for instance in queryset:
             instance.skip_signal = True
             instance.op_refresh(save=True)
-            refreshed = refreshed + 1
-        if captured == 1:
-            message_bit = "1 instance was"
-        else:
-            message_bit = "%s instances were" % refreshed
-        self.message_user(
-            request,
-            "%s successfully refreshed." % message_bit
-        )
+        count = len(queryset)
+        self.message_user(request, ungettext(
+            '%d instance was successfully refreshed.',
+            '%d instances were successfully refreshed.',
+            count) % count)
     refresh.short_description = ugettext('Refresh selected instances')
 
     def dismiss(self, request, queryset):
-        dismissed = 0
         for instance in queryset:
             instance.skip_signal = True
             instance.op_dismiss(save=True)
-            dismissed = dismissed + 1
-        if captured == 1:
-            message_bit = "1 instance was"
-        else:
-            message_bit = "%s instances were" % dismissed
-        self.message_user(
-            request,
-            "%s successfully dismissed." % message_bit
-        )
+        count = len(queryset)
+        self.message_user(request, ungettext(
+            '%d instance was successfully dismissed.',
+            '%d instances were successfully dismissed.',
+            count) % count)
     dismiss.short_description = ugettext('Dismiss selected instances')
 
-    def get_readonly_fields(self, request, obj=None):
-        return models.Card.get_readonly_fields(obj)
-
 
 @admin.register(models.Plan)
 class PlanAdmin(admin.ModelAdmin):
@@ -67,35 +138,25 @@ class PlanAdmin(admin.ModelAdmin):
                     'repeat_unit', 'creation_date')
 
     def refresh(self, request, queryset):
-        refreshed = 0
         for instance in queryset:
             instance.skip_signal = True
             instance.op_refresh(save=True)
-            refreshed = refreshed + 1
-        if captured == 1:
-            message_bit = "1 instance was"
-        else:
-            message_bit = "%s instances were" % refreshed
-        self.message_user(
-            request,
-            "%s successfully refreshed." % message_bit
-        )
+        count = len(queryset)
+        self.message_user(request, ungettext(
+            '%d instance was successfully refreshed.',
+            '%d instances were successfully refreshed.',
+            count) % count)
     refresh.short_description = ugettext('Refresh selected instances')
 
     def dismiss(self, request, queryset):
-        dismissed = 0
         for instance in queryset:
             instance.skip_signal = True
             instance.op_dismiss(save=True)
-            dismissed = dismissed + 1
-        if captured == 1:
-            message_bit = "1 instance was"
-        else:
-            message_bit = "%s instances were" % dismissed
-        self.message_user(
-            request,
-            "%s successfully dismissed." % message_bit
-        )
+        count = len(queryset)
+        self.message_user(request, ungettext(
+            '%d instance was successfully dismissed.',
+            '%d instances were successfully dismissed.',
+            count) % count)
     dismiss.short_description = ugettext('Dismiss selected instances')
 
     def get_readonly_fields(self, request, obj=None):
@@ -108,37 +169,29 @@ class SubscriptionAdmin(admin.ModelAdmin):
     actions = ['refresh', 'dismiss', ]
     list_display = ('pk', 'openpay_id', 'customer', 'plan', 'card',
                     'creation_date')
+    list_select_related = ('customer', 'plan', 'card')
+    raw_id_fields = ('customer', 'plan', 'card')
 
     def refresh(self, request, queryset):
-        refreshed = 0
         for instance in queryset:
             instance.skip_signal = True
             instance.op_refresh(save=True)
-            refreshed = refreshed + 1
-        if refreshed == 1:
-            message_bit = "1 instance was"
-        else:
-            message_bit = "%s instances were" % refreshed
-        self.message_user(
-            request,
-            "%s successfully refreshed." % message_bit
-        )
+        count = len(queryset)
+        self.message_user(request, ungettext(
+            '%d instance was successfully refreshed.',
+            '%d instances were successfully refreshed.',
+            count) % count)
     refresh.short_description = ugettext('Refresh selected instances')
 
     def dismiss(self, request, queryset):
-        dismissed = 0
         for instance in queryset:
             instance.skip_signal = True
             instance.op_dismiss(save=True)
-            dismissed = dismissed + 1
-        if captured == 1:
-            message_bit = "1 instance was"
-        else:
-            message_bit = "%s instances were" % dismissed
-        self.message_user(
-            request,
-            "%s successfully dismissed." % message_bit
-        )
+        count = len(queryset)
+        self.message_user(request, ungettext(
+            '%d instance was successfully dismissed.',
+            '%d instances were successfully dismissed.',
+            count) % count)
     dismiss.short_description = ugettext('Dismiss selected instances')
 
     def get_readonly_fields(self, request, obj=None):
@@ -151,37 +204,29 @@ class RefundAdmin(admin.ModelAdmin):
     actions = ['refresh', 'dismiss', ]
     list_display = ('pk', 'openpay_id', 'customer', 'charge', 'amount',
                     'creation_date')
+    list_select_related = ('customer', 'charge')
+    raw_id_fields = ('customer', 'card', 'charge')
 
     def refresh(self, request, queryset):
-        refreshed = 0
         for instance in queryset:
             instance.skip_signal = True
             instance.op_refresh(save=True)
-            refreshed = refreshed + 1
-        if captured == 1:
-            message_bit = "1 instance was"
-        else:
-            message_bit = "%s instances were" % refreshed
-        self.message_user(
-            request,
-            "%s successfully refreshed." % message_bit
-        )
+        count = len(queryset)
+        self.message_user(request, ungettext(
+            '%d instance was successfully refreshed.',
+            '%d instances were successfully refreshed.',
+            count) % count)
     refresh.short_description = ugettext('Refresh selected instances')
 
     def dismiss(self, request, queryset):
-        dismissed = 0
         for instance in queryset:
             instance.skip_signal = True
             instance.op_dismiss(save=True)
-            dismissed = dismissed + 1
-        if captured == 1:
-            message_bit = "1 instance was"
-        else:
-            message_bit = "%s instances were" % dismissed
-        self.message_user(
-            request,
-            "%s successfully dismissed." % message_bit
-        )
+        count = len(queryset)
+        self.message_user(request, ungettext(
+            '%d instance was successfully dismissed.',
+            '%d instances were successfully dismissed.',
+            count) % count)
     dismiss.short_description = ugettext('Dismiss selected instances')
 
     def get_readonly_fields(self, request, obj=None):
@@ -194,67 +239,72 @@ class ChargeAdmin(admin.ModelAdmin):
     actions = ['refresh', 'capture', 'refund', 'dismiss', ]
     list_display = ('pk', 'openpay_id', 'customer', 'card', 'amount',
                     'creation_date')
+    list_select_related = ('customer', 'card')
+    raw_id_fields = ('customer', 'card', 'subscription')
 
     def refresh(self, request, queryset):
-        refreshed = 0
         for instance in queryset:
             instance.skip_signal = True
             instance.op_refresh(save=True)
-            refreshed = refreshed + 1
-        if captured == 1:
-            message_bit = "1 instance was"
-        else:
-            message_bit = "%s instances were" % refreshed
-        self.message_user(
-            request,
-            "%s successfully refreshed." % message_bit
-        )
+        count = len(queryset)
+        self.message_user(request, ungettext(
+            '%d instance was successfully refreshed.',
+            '%d instances were successfully refreshed.',
+            count) % count)
     refresh.short_description = ugettext('Refresh selected instances')
 
     def capture(self, request, queryset):
-        captured = 0
-        for charge in queryset:
-            charge.op_capture()
-            captured = captured + 1
-        if captured == 1:
-            message_bit = "1 charge was"
-        else:
-            message_bit = "%s charges were" % captured
-        self.message_user(
-            request,
-            "%s successfully captured." % message_bit
-        )
+        if async_commit:
+            count = enqueue_charges(queryset, 'captureCharge')
+            self.message_user(request, ungettext(
+                '%d charge will be captured.',
+                '%d charges will be captured.',
+                count) % count)
+            return
+        processed, failed = process_charges(queryset, 'op_capture')
+        count = len(processed)
+        self.message_user(request, ungettext(
+            '%d charge was successfully captured.',
+            '%d charges were successfully captured.',
+            count) % count)
+        if failed:
+            self.message_user(request, ugettext(
+                'These charges could not be captured or stored: %s'
+            ) % ', '.join(str(charge) for charge in failed), messages.ERROR)
     capture.short_description = ugettext('Capture selected charges')
 
     def refund(self, request, queryset):
-        refunded = 0
-        for charge in queryset:
-            charge.op_refund()
-            refunded = refunded + 1
-        if refunded == 1:
-            message_bit = "1 charge was"
-        else:
-            message_bit = "%s charges were" % refunded
-            self.message_user(
-                request,
-                "%s successfully refunded." % message_bit
-            )
+        if async_commit:
+            count = enqueue_charges(queryset, 'refundCharge')
+            self.message_user(request, ungettext(
+                '%d charge will be refunded.',
+                '%d charges will be refunded.',
+                count) % count)
+            return
+        # The refunded flag is stored with the rest of the fields
+        processed, failed = process_charges(
+            queryset, 'op_refund',
+            fields=models.Charge.op_fill_fields + ('refunded', ), save=False)
+        count = len(processed)
+        self.message_user(request, ungettext(
+            '%d charge was successfully refunded.',
+            '%d charges were successfully refunded.',
+            count) % count)
+        if failed:
+            self.message_user(request, ugettext(
+                'These charges could not be refunded or stored: %s'
+            ) % ', '.join(str(charge) for charge in failed), messages.ERROR)
     refund.short_description = ugettext('Refund selected charges')
 
     def dismiss(self, request, queryset):
-        dismissed = 0
         for instance in queryset:
             instance.skip_signal = True
             instance.op_dismiss(save=True)
-            dismissed = dismissed + 1
-        if captured == 1:
-            message_bit = "1 instance was"
-        else:
-            message_bit = "%s instances were" % dismissed
-        self.message_user(
-            request,
-            "%s successfully dismissed." % message_bit
-        )
+        count = len(queryset)
+        self.message_user(request, ungettext(
+            '%d instance was successfully dismissed.',
+            '%d instances were successfully dismissed.',
+            count) % count)
     dismiss.short_description = ugettext('Dismiss selected instances')
 
     def get_readonly_fields(self, request, obj=None):
@@ -25,3 +25,12 @@ def skippable(signal_func):
             return None
         return signal_func(sender, instance, **kwargs)
     return _decorator
+
+
+def validated(signal_func):
+    @wraps(signal_func)
+    def _decorator(sender, instance, **kwargs):
+        if not getattr(instance, 'skip_validation', False):
+            instance.full_clean()
+        return signal_func(sender, instance, **kwargs)
+    return _decorator
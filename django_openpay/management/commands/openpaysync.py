@@ -1,7 +1,6 @@
 from django.db import transaction
 from django.core.management.base import BaseCommand
 from django.conf import settings
-from django.utils.dateparse import parse_datetime, parse_date
 
 from decimal import Decimal
 import os
@@ -34,7 +33,7 @@ class Command(BaseCommand):
                     dbobj.trial_days = planJson['trial_days']
                     dbobj.repeat_every = planJson['repeat_every']
                     dbobj.status = planJson['status']
-                    dbobj.creation_date = parse_datetime(
+                    dbobj.creation_date = djop.utils.parse_openpay_datetime(
                         planJson['creation_date'])
                     dbobj.save()
                     dbPlans[planJson['id']] = dbobj.pk
@@ -61,7 +60,7 @@ class Command(BaseCommand):
                     dbobj.brand = cardJson['brand']
                     dbobj.month = cardJson['expiration_month'][-2:]
                     dbobj.year = cardJson['expiration_year'][-2:]
-                    dbobj.creation_date = parse_datetime(
+                    dbobj.creation_date = djop.utils.parse_openpay_datetime(
                         cardJson['creation_date'])
                     dbobj.save()
                     dbCards[cardJson['id']] = dbobj.pk
@@ -84,20 +83,20 @@ class Command(BaseCommand):
                     dbobj.card_id = cards[subscriptionJson['card']['id']]
                     dbobj.cancel_at_period_end = \
                         subscriptionJson['cancel_at_period_end']
-                    new_charge_date = parse_date(
+                    new_charge_date = djop.utils.parse_openpay_date(
                         subscriptionJson['charge_date'])
                     dbobj.latest_charge_date = dbobj.charge_date if \
                         dbobj.charge_date != new_charge_date else \
                         dbobj.latest_charge_date
                     dbobj.charge_date = new_charge_date
-                    dbobj.period_end_date = parse_date(
+                    dbobj.period_end_date = djop.utils.parse_openpay_date(
                         subscriptionJson['period_end_date'])
                     dbobj.status = subscriptionJson['status']
                     dbobj.current_period_number = \
                         subscriptionJson['current_period_number']
-                    dbobj.trial_end_date = parse_date(
+                    dbobj.trial_end_date = djop.utils.parse_openpay_date(
                         subscriptionJson['trial_end_date'])
-                    dbobj.creation_date = parse_datetime(
+                    dbobj.creation_date = djop.utils.parse_openpay_datetime(
                         subscriptionJson['creation_date'])
                     dbobj.save()
         return subscriptionsList.get('count', 0)
@@ -117,7 +116,7 @@ class Command(BaseCommand):
                     dbobj = customerModel(openpay_id=customerJson['id'])
                 finally:
                     dbobj.skip_signal = True
-                    dbobj.op_refresh(save=True)
+                    dbobj.op_refresh(save=True, op_object=customerJson)
                     cards = self.cards(dbobj)
                     cardsNum += len(cards)
                     subs = self.subscriptions(dbobj, plans, cards)
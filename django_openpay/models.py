@@ -1,31 +1,73 @@
 from django.conf import settings
 from django.core.validators import RegexValidator
-from django.db import models
-from django.db.models.fields.related import ManyToManyField
-from django.db.models.signals import pre_save, pre_delete, post_delete
+from django.db import connections, models, transaction
+from django.db.models import Case, Value, When
+from django.db.models.functions import Cast
+from django.db.models.signals import pre_save, post_save, pre_delete, \
+    post_delete
 from django.dispatch import receiver
-from django.utils.dateparse import parse_datetime, parse_date
+from django.utils.functional import cached_property
 
 from decimal import Decimal
+import re
 from jsonfield import JSONField
 
-from . import openpay, hardcode, ugettext_lazy, exceptions, ungettext_lazy
-from .decorators import skippable
-from .utils import get_customer_model
+from . import openpay, hardcode, ugettext_lazy, exceptions, ungettext_lazy, \
+    async_commit
+from .decorators import skippable, validated
+from .utils import get_customer_model, parse_openpay_datetime, \
+    parse_openpay_date
 
 
+# Compiled once and limited to ASCII digits (\d also matches Unicode digits)
+phone_regex = re.compile(r'\A\d{9,15}\Z', re.ASCII)
 phone_validator = RegexValidator(
-    regex=r'^\d{9,15}$',
+    regex=phone_regex,
     message=ugettext_lazy("The telephone number can only contain digits. "
                           " The maximum number of digits is 15.")
 )
 
 CustomerModel = settings.OPENPAY_CUSTOMER_MODEL
 
+# The readonly fields are shared by every admin page, so they are built once
+_ADDRESS_READONLY = ('creation_date', )
+_CUSTOMER_READONLY = ('openpay_id', 'creation_date')
+_CARD_READONLY = ('openpay_id', 'card_type', 'holder', 'number', 'month',
+                  'year', 'bank_name', 'brand', 'customer', 'creation_date')
+_PLAN_READONLY_NEW = ('openpay_id', 'creation_date')
+_PLAN_READONLY_EDIT = ('openpay_id', 'amount', 'currency', 'retry_times',
+                       'status_after_retry', 'repeat_every', 'repeat_unit',
+                       'creation_date')
+_SUBSCRIPTION_READONLY_NEW = ('openpay_id', 'charge_date', 'period_end_date',
+                              'status', 'latest_charge_date',
+                              'current_period_number', 'creation_date')
+_SUBSCRIPTION_READONLY_EDIT = ('openpay_id', 'customer', 'plan',
+                               'charge_date', 'latest_charge_date',
+                               'period_end_date', 'status',
+                               'current_period_number', 'creation_date')
+_TRANSACTION_READONLY_NEW = ('openpay_id', 'authorization',
+                             'transaction_type', 'operation_type', 'status',
+                             'error_message', 'operation_date',
+                             'creation_date')
+# bank_account, card_points
+_TRANSACTION_READONLY_EDIT = ('openpay_id', 'authorization',
+                              'transaction_type', 'operation_type', 'method',
+                              'order_id', 'status', 'amount', 'description',
+                              'error_message', 'customer', 'currency', 'card',
+                              'operation_date', 'creation_date')
+_CHARGE_READONLY_NEW = ('conciliated', 'refunded') + \
+    _TRANSACTION_READONLY_NEW
+_CHARGE_READONLY_EDIT = ('conciliated', 'refunded') + \
+    _TRANSACTION_READONLY_EDIT
+_REFUND_READONLY_NEW = ('charge', 'conciliated') + _TRANSACTION_READONLY_NEW
+_REFUND_READONLY_EDIT = ('charge', 'conciliated') + _TRANSACTION_READONLY_EDIT
+
 
 class AbstractOpenpayBase(models.Model):
+    # Indexed, since objects are looked up by it (webhooks, openpaysync, ...)
     openpay_id = models.CharField(
         max_length=100,
+        db_index=True,
         blank=True,
         null=False,
         verbose_name=ugettext_lazy('OpenPay ID'))
@@ -36,6 +78,14 @@ class AbstractOpenpayBase(models.Model):
         null=False,
         verbose_name=ugettext_lazy('Creation date'))
 
+    # Pairs of (local attribute, Openpay attribute) sent to Openpay when an
+    # existing object is committed. Only when one of the local attributes
+    # (op_tracked_fields) changes, the commit will reach the Openpay servers.
+    op_remote_fields = ()
+    op_tracked_fields = ()
+    # Fields written by op_fill
+    op_fill_fields = ()
+
     class Meta:
         abstract = True
 
@@ -43,31 +93,142 @@ class AbstractOpenpayBase(models.Model):
     def get_readonly_fields(self, instance=None):
         raise NotImplementedError
 
+    @classmethod
+    def op_bulk_save(cls, instances, fields, batch_size=None):
+        # Save the given fields of already stored instances using a single
+        # UPDATE per batch. No signals are sent, so nothing is committed to
+        # the Openpay servers.
+        fields = [cls._meta.get_field(name) for name in fields]
+        instances = [instance for instance in instances if instance.pk]
+        if not instances:
+            return
+        connection = connections[cls.objects.db]
+        # Every row binds its pk and value for each field, plus its pk in
+        # the filter, and the database limits the parameters of a query
+        max_batch_size = max(connection.ops.bulk_batch_size(
+            ['pk'] + fields + fields, instances), 1)
+        if batch_size:
+            batch_size = min(batch_size, max_batch_size)
+        else:
+            batch_size = max_batch_size
+        # PostgreSQL cannot guess the type of the CASE parameters
+        cast = connection.vendor == 'postgresql'
+        with transaction.atomic(using=cls.objects.db):
+            for start in range(0, len(instances), batch_size):
+                batch = instances[start:start + batch_size]
+                values = {}
+                for field in fields:
+                    whens = []
+                    for instance in batch:
+                        value = Value(getattr(instance, field.attname),
+                                      output_field=field)
+                        if cast:
+                            value = Cast(value, field)
+                        whens.append(When(pk=instance.pk, then=value))
+                    values[field.attname] = Case(*whens, output_field=field)
+                cls.objects.filter(
+                    pk__in=[instance.pk for instance in batch]
+                ).update(**values)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.op_snapshot()
+        return instance
+
     @property
     def op_dismissable(self):
         if self.openpay_id:
             return True
         return False
 
+    @cached_property
+    def _op_(self):
+        # The Openpay object, pulled with op_load the first time it is used.
+        # op_load and the creation methods overwrite it directly.
+        self.op_load()
+        return self.__dict__['_op_']
+
+    def op_snapshot(self):
+        # Remember the tracked values as they are in the Openpay servers.
+        # Deferred fields are left out, so they always count as changed.
+        self._op_snapshot_ = {
+            f: self.__dict__[f] for f in self.op_tracked_fields
+            if f in self.__dict__}
+        self.force_commit = False
+
+    def op_changed_fields(self):
+        # The tracked fields that differ from the last snapshot. Setting
+        # force_commit makes every tracked field count as changed, for the
+        # values that cannot be tracked (e.g. the contents of an address).
+        if getattr(self, 'force_commit', False):
+            return set(self.op_tracked_fields)
+        snapshot = getattr(self, '_op_snapshot_', {})
+        return {f for f in self.op_tracked_fields
+                if f not in snapshot or getattr(self, f) != snapshot[f]}
+
+    def op_value(self, field):
+        # The value of a local attribute, as it is sent to Openpay
+        return getattr(self, field)
+
+    def op_values(self):
+        # The op_remote_fields values, keyed by their Openpay attribute
+        return {remote: self.op_value(local)
+                for local, remote in self.op_remote_fields}
+
     def op_commit(self):
         # Save the changes in the object directly to the openpay servers
         raise NotImplementedError
 
-    def op_refresh(self, save=False):
+    def op_commit_on_save(self):
+        # Called by the pre_save signals. With OPENPAY_ASYNC_COMMIT, existing
+        # objects are committed by a Celery worker once the transaction ends.
+        # New objects are always committed here, because their openpay_id and
+        # creation_date come from Openpay.
+        # The task is enqueued by op_commit_after_save (post_save signals),
+        # so the worker always loads the stored row.
+        self._op_commit_later_ = False
+        if not async_commit or not self.openpay_id:
+            self.op_commit()
+        elif self.op_changed_fields() or not self.op_tracked_fields:
+            self._op_commit_later_ = True
+
+    def op_commit_after_save(self):
+        # Called by the post_save signals, enqueues the commit decided by
+        # op_commit_on_save once the transaction is committed
+        if not getattr(self, '_op_commit_later_', False):
+            return
+        from .tasks import commitOpenpayObject
+        self._op_commit_later_ = False
+        # The worker will send the stored values
+        self.op_snapshot()
+        opts = self._meta
+        transaction.on_commit(lambda: commitOpenpayObject.delay(
+            opts.app_label, opts.model_name, self.pk))
+
+    def op_refresh(self, save=False, op_object=None):
         # Call the op_load, and op_fill always. This function is designed to
         # maintain the object updated with what is in the openpay server.
-        self.op_load()
-        self.op_fill()
+        # If the Openpay object was already received (e.g. from a listing),
+        # it can be passed as op_object to skip the op_load request.
+        if op_object is not None:
+            self._op_ = op_object
+        else:
+            self.op_load()
+        fields = self.op_fill()
+        self.op_snapshot()
         if save:
-            self.save()
+            # Stored objects only need the fields filled from Openpay
+            self.save(update_fields=fields if self.pk else None)
 
     def op_load(self):
         # Pull the Openpay data, always
         raise NotImplementedError
 
     def op_fill(self):
-        # Only update the object's fields with the openpay data.
-        # If the Openpay data has not been loaded, call op_load.
+        # Only update the object's fields with the openpay data and return
+        # the names of the updated fields (op_fill_fields).
+        # If the Openpay data has not been loaded, _op_ calls op_load.
         raise NotImplementedError
 
     def op_dismiss(self, save=False):
@@ -75,8 +236,6 @@ class AbstractOpenpayBase(models.Model):
         # this same removal could be a logical or physical destruction, but the
         # way to call it is the same.
         if self.op_dismissable:
-            if not hasattr(self, '_op_'):
-                self.op_load()
             self._op_.delete()
 
             if save:
@@ -125,29 +284,45 @@ class Address(models.Model):
 
     @classmethod
     def get_readonly_fields(self, instance=None):
-        if instance:
-            return ['creation_date']
-        return ['creation_date']
+        return _ADDRESS_READONLY
 
     # Obtained and edited from:
     # https://goo.gl/SqkLbo
     @property
     def json_dict(self):
-        opts = self._meta
-        data = {}
-        for f in opts.concrete_fields + opts.many_to_many:
-            if isinstance(f, ManyToManyField):
-                if self.pk is None:
-                    data[f.name] = []
-                else:
-                    data[f.name] = list(
-                        f.value_from_object(self).values_list('pk', flat=True)
-                    )
-            elif f.name not in ['id', 'creation_date']:
-                data[f.name] = f.value_from_object(self)
+        data = {f.name: f.value_from_object(self)
+                for f in _ADDRESS_JSON_FIELDS}
+        for f in _ADDRESS_JSON_M2M_FIELDS:
+            if self.pk is None:
+                data[f.name] = []
+            else:
+                data[f.name] = list(
+                    f.value_from_object(self).values_list('pk', flat=True)
+                )
         return data
 
 
+# The fields sent to Openpay never change, so they are resolved only once
+_ADDRESS_JSON_FIELDS = tuple(
+    f for f in Address._meta.concrete_fields
+    if f.name not in ('id', 'creation_date'))
+_ADDRESS_JSON_M2M_FIELDS = tuple(Address._meta.many_to_many)
+
+
+@receiver(post_save, sender=Address)
+@skippable
+def address_postsave(sender, instance, created=False, **kwargs):
+    # The customers only track their address_id, so the address contents are
+    # committed to Openpay whenever the address changes
+    if created:
+        return
+    customers = get_customer_model().objects.filter(
+        address=instance).exclude(openpay_id='')
+    for customer in customers:
+        customer.force_commit = True
+        customer.save()
+
+
 # class Customer(AbstractOpenpayBase):
 class AbstractCustomer(AbstractOpenpayBase):
     first_name = models.CharField(
@@ -177,56 +352,53 @@ class AbstractCustomer(AbstractOpenpayBase):
         related_name='customer',
         verbose_name=ugettext_lazy('Address'))
 
+    op_remote_fields = (('first_name', 'name'), ('last_name', 'last_name'),
+                        ('email', 'email'), ('phone_number', 'phone_number'),
+                        ('address_id', 'address'))
+    op_tracked_fields = tuple(local for local, remote in op_remote_fields)
+    op_fill_fields = ('first_name', 'last_name', 'email', 'phone_number',
+                      'creation_date')
+
     class Meta:
         abstract = True
 
     @classmethod
     def get_readonly_fields(self, instance=None):
-        if instance:
-            return ['openpay_id', 'creation_date']
-        return ['openpay_id', 'creation_date']
+        return _CUSTOMER_READONLY
 
     def op_cards(self):
         if self.openpay_id:
-            if not hasattr(self, '_op_'):
-                self.op_load()
             return self._op_.cards.all()
         else:
             raise exceptions.OpenpayObjectDoesNotExist
 
     def op_subscriptions(self):
         if self.openpay_id:
-            if not hasattr(self, '_op_'):
-                self.op_load()
             return self._op_.subscriptions.all()
         else:
             raise exceptions.OpenpayObjectDoesNotExist
 
     def op_commit(self):
         if self.openpay_id:
-            if not hasattr(self, '_op_'):
-                self.op_load()
-            self._op_.name = self.first_name
-            self._op_.last_name = self.last_name if \
-                self.last_name else None
-            self._op_.email = self.email
-            self._op_.phone_number = self.phone_number if \
-                self.phone_number else None
-            self._op_.address = self.address.json_dict if \
-                self.address else None
+            if not self.op_changed_fields():
+                return
+            for remote, value in self.op_values().items():
+                setattr(self._op_, remote, value)
             self._op_.save()
 
         else:
-            self._op_ = openpay.Customer.create(
-                name=self.first_name,
-                last_name=self.last_name if self.last_name else None,
-                email=self.email,
-                phone_number=self.phone_number if self.phone_number else None,
-                address=self.address.json_dict if self.address else None)
+            self._op_ = openpay.Customer.create(**self.op_values())
             self.openpay_id = self._op_.id
         self.op_fill()
+        self.op_snapshot()
         # We have a pre_save signal, so we dont need to save it manually
 
+    def op_value(self, field):
+        if field == 'address_id':
+            return self.address.json_dict if self.address else None
+        # Openpay expects null instead of empty strings
+        return getattr(self, field) or None
+
     def op_load(self):
         if self.openpay_id:
             self._op_ = openpay.Customer.retrieve(self.openpay_id)
@@ -234,14 +406,13 @@ class AbstractCustomer(AbstractOpenpayBase):
             raise exceptions.OpenpayObjectDoesNotExist
 
     def op_fill(self):
-        if not hasattr(self, '_op_'):
-            self.op_load()
         self.first_name = self._op_.name
         self.last_name = self._op_.last_name
         self.email = self._op_.email
         self.phone_number = self._op_.phone_number
-        self.creation_date = parse_datetime(
+        self.creation_date = parse_openpay_datetime(
             self._op_.creation_date)
+        return self.op_fill_fields
 
     @property
     def full_name(self):
@@ -255,10 +426,16 @@ class AbstractCustomer(AbstractOpenpayBase):
 
 @receiver(pre_save, sender=CustomerModel)
 @skippable
+@validated
 def customer_presave(sender, instance=None, **kwargs):
-    instance.full_clean()
     instance.email = instance.email.strip()
-    instance.op_commit()
+    instance.op_commit_on_save()
+
+
+@receiver(post_save, sender=CustomerModel)
+@skippable
+def customer_postsave(sender, instance, **kwargs):
+    instance.op_commit_after_save()
 
 
 @receiver(pre_delete, sender=CustomerModel)
@@ -318,13 +495,12 @@ class Card(AbstractOpenpayBase):
         related_name='cards',
         verbose_name=ugettext_lazy('Owner'))
 
+    op_fill_fields = ('card_type', 'holder', 'number', 'bank_name', 'brand',
+                      'month', 'year', 'creation_date')
+
     @classmethod
     def get_readonly_fields(self, instance=None):
-        if instance:
-            return ['openpay_id', 'card_type', 'holder', 'number', 'month',
-                    'bank_name', 'brand', 'year', 'customer', 'creation_date']
-        return ['openpay_id', 'card_type', 'holder', 'number', 'month', 'year',
-                'bank_name', 'brand', 'customer', 'creation_date']
+        return _CARD_READONLY
 
     @classmethod
     def create_with_token(cls, customerId, tokenId, deviceId, alias=''):
@@ -338,7 +514,12 @@ class Card(AbstractOpenpayBase):
             customer=customer)
         card._op_ = card_op
         card.op_fill()
-        card.save()
+        # Every field was just filled by Openpay
+        card.skip_validation = True
+        try:
+            card.save()
+        finally:
+            card.skip_validation = False
         return card
 
     def op_commit(self):
@@ -359,8 +540,6 @@ class Card(AbstractOpenpayBase):
             raise exceptions.OpenpayObjectDoesNotExist
 
     def op_fill(self):
-        if not hasattr(self, '_op_'):
-            self.op_load()
         self.card_type = self._op_.type
         self.holder = self._op_.holder_name
         self.number = self._op_.card_number[-4:]
@@ -368,8 +547,9 @@ class Card(AbstractOpenpayBase):
         self.brand = self._op_.brand
         self.month = self._op_.expiration_month[-2:]
         self.year = self._op_.expiration_year[-2:]
-        self.creation_date = parse_datetime(
+        self.creation_date = parse_openpay_datetime(
             self._op_.creation_date)
+        return self.op_fill_fields
 
     def __str__(self):
         if self.alias:
@@ -379,8 +559,11 @@ class Card(AbstractOpenpayBase):
 
 @receiver(pre_save, sender=Card)
 @skippable
+@validated
 def card_presave(sender, instance=None, **kwargs):
-    instance.full_clean()
+    # Cards are only committed by create_with_token, this receiver only
+    # validates them (@validated)
+    pass
 
 
 @receiver(post_delete, sender=Card)
@@ -459,6 +642,12 @@ class Plan(AbstractOpenpayBase):
         null=False,
         verbose_name=ugettext_lazy('Frecuency Unit'))
 
+    op_remote_fields = (('name', 'name'), ('trial_days', 'trial_days'))
+    op_tracked_fields = tuple(local for local, remote in op_remote_fields)
+    op_fill_fields = ('name', 'amount', 'status_after_retry', 'retry_times',
+                      'repeat_unit', 'trial_days', 'repeat_every',
+                      'creation_date')
+
     @property
     def repeat_verbose(self):
         return ungettext_lazy(
@@ -472,17 +661,15 @@ class Plan(AbstractOpenpayBase):
     @classmethod
     def get_readonly_fields(self, instance=None):
         if instance:
-            return ['openpay_id', 'amount', 'currency', 'retry_times',
-                    'status_after_retry', 'repeat_every', 'repeat_unit',
-                    'creation_date']
-        return ['openpay_id', 'creation_date']
+            return _PLAN_READONLY_EDIT
+        return _PLAN_READONLY_NEW
 
     def op_commit(self):
         if self.openpay_id:
-            if not hasattr(self, '_op_'):
-                self.op_load()
-            self._op_.name = self.name
-            self._op_.trial_days = self.trial_days
+            if not self.op_changed_fields():
+                return
+            for remote, value in self.op_values().items():
+                setattr(self._op_, remote, value)
             self._op_.save()
 
         else:
@@ -497,6 +684,7 @@ class Plan(AbstractOpenpayBase):
                 repeat_every=self.repeat_every)
             self.openpay_id = self._op_.id
         self.op_fill()
+        self.op_snapshot()
 
     def op_load(self):
         if self.openpay_id:
@@ -505,8 +693,6 @@ class Plan(AbstractOpenpayBase):
             raise exceptions.OpenpayObjectDoesNotExist
 
     def op_fill(self):
-        if not hasattr(self, '_op_'):
-            self.op_load()
         self.name = self._op_.name
         self.amount = Decimal(self._op_.amount)
         self.status_after_retry = self._op_.status_after_retry
@@ -514,8 +700,9 @@ class Plan(AbstractOpenpayBase):
         self.repeat_unit = self._op_.repeat_unit
         self.trial_days = self._op_.trial_days
         self.repeat_every = self._op_.repeat_every
-        self.creation_date = parse_datetime(
+        self.creation_date = parse_openpay_datetime(
             self._op_.creation_date)
+        return self.op_fill_fields
 
     def __str__(self):
         return self.name
@@ -523,9 +710,15 @@ class Plan(AbstractOpenpayBase):
 
 @receiver(pre_save, sender=Plan)
 @skippable
+@validated
 def plan_presave(sender, instance=None, **kwargs):
-    instance.full_clean()
-    instance.op_commit()
+    instance.op_commit_on_save()
+
+
+@receiver(post_save, sender=Plan)
+@skippable
+def plan_postsave(sender, instance, **kwargs):
+    instance.op_commit_after_save()
 
 
 @receiver(post_delete, sender=Plan)
@@ -587,14 +780,20 @@ class Subscription(AbstractOpenpayBase):
         null=True,
         verbose_name=ugettext_lazy('Trial end date'))
 
+    op_remote_fields = (('trial_end_date', 'trial_end_date'),
+                        ('card_id', 'card_id'),
+                        ('cancel_at_period_end', 'cancel_at_period_end'))
+    op_tracked_fields = tuple(local for local, remote in op_remote_fields)
+    op_fill_fields = ('cancel_at_period_end', 'latest_charge_date',
+                      'charge_date', 'period_end_date', 'status',
+                      'current_period_number', 'trial_end_date',
+                      'creation_date')
+
     @classmethod
     def get_readonly_fields(self, instance=None):
         if instance:
-            return ['openpay_id', 'customer', 'plan', 'charge_date',
-                    'latest_charge_date', 'period_end_date', 'status',
-                    'current_period_number', 'creation_date']
-        return ['openpay_id', 'charge_date', 'period_end_date', 'status',
-                'latest_charge_date', 'current_period_number', 'creation_date']
+            return _SUBSCRIPTION_READONLY_EDIT
+        return _SUBSCRIPTION_READONLY_NEW
 
     @property
     def op_dismissable(self):
@@ -605,14 +804,11 @@ class Subscription(AbstractOpenpayBase):
 
     def op_commit(self):
         if self.openpay_id:
-            if not hasattr(self, '_op_'):
-                self.op_load()
-            self._op_.trial_end_date = \
-                self.trial_end_date.isoformat()
+            if not self.op_changed_fields():
+                return
             self._op_.card = None
-            self._op_.card_id = self.card.openpay_id
-            self._op_.cancel_at_period_end = \
-                self.cancel_at_period_end
+            for remote, value in self.op_values().items():
+                setattr(self._op_, remote, value)
             self._op_.save()
 
         else:
@@ -624,15 +820,23 @@ class Subscription(AbstractOpenpayBase):
                 self.customer.openpay_id
             ).subscriptions.create(
                 plan_id=self.plan.openpay_id,
-                trial_end_date=self.trial_end_date.isoformat()
-                if self.trial_end_date else None,
-                card_id=self.card.openpay_id)
+                trial_end_date=self.op_value('trial_end_date'),
+                card_id=self.op_value('card_id'))
             self.openpay_id = self._op_.id
             if self.cancel_at_period_end:
                 self._op_.cancel_at_period_end = \
                     self.cancel_at_period_end
                 self._op_.save()
         self.op_fill()
+        self.op_snapshot()
+
+    def op_value(self, field):
+        if field == 'trial_end_date':
+            return self.trial_end_date.isoformat() \
+                if self.trial_end_date else None
+        if field == 'card_id':
+            return self.card.openpay_id
+        return super().op_value(field)
 
     def op_load(self):
         if not self.customer or not self.customer.openpay_id:
@@ -646,24 +850,23 @@ class Subscription(AbstractOpenpayBase):
             raise exceptions.OpenpayObjectDoesNotExist
 
     def op_fill(self):
-        if not hasattr(self, '_op_'):
-            self.op_load()
         self.cancel_at_period_end = \
             self._op_.cancel_at_period_end
-        new_charge_date = parse_date(
+        new_charge_date = parse_openpay_date(
             self._op_.charge_date)
         self.latest_charge_date = self.charge_date if \
             self.charge_date != new_charge_date else \
             self.latest_charge_date
         self.charge_date = new_charge_date
-        self.period_end_date = parse_date(
+        self.period_end_date = parse_openpay_date(
             self._op_.period_end_date)
         self.status = self._op_.status
         self.current_period_number = self._op_.current_period_number
-        self.trial_end_date = parse_date(
+        self.trial_end_date = parse_openpay_date(
             self._op_.trial_end_date)
-        self.creation_date = parse_datetime(
+        self.creation_date = parse_openpay_datetime(
             self._op_.creation_date)
+        return self.op_fill_fields
 
     def __str__(self):
         return '{plan} |> {customer}'.format(
@@ -673,11 +876,17 @@ class Subscription(AbstractOpenpayBase):
 
 @receiver(pre_save, sender=Subscription)
 @skippable
+@validated
 def subscription_presave(sender, instance=None, **kwargs):
-    instance.full_clean()
     if instance.card.customer_id != instance.customer_id:
         raise exceptions.OpenpayNotUserCard
-    instance.op_commit()
+    instance.op_commit_on_save()
+
+
+@receiver(post_save, sender=Subscription)
+@skippable
+def subscription_postsave(sender, instance, **kwargs):
+    instance.op_commit_after_save()
 
 
 @receiver(post_delete, sender=Subscription)
@@ -769,14 +978,8 @@ class AbstractTransaction(AbstractOpenpayBase):
     @classmethod
     def get_readonly_fields(self, instance=None):
         if instance:
-            return ['openpay_id', 'authorization', 'transaction_type',
-                    'operation_type', 'method', 'order_id', 'status', 'amount',
-                    'description', 'error_message', 'customer', 'currency',
-                    'card', 'operation_date', 'creation_date', ]
-            # bank_account, card_points
-        return ['openpay_id', 'authorization', 'transaction_type',
-                'operation_type', 'status', 'error_message', 'operation_date',
-                'creation_date', ]
+            return _TRANSACTION_READONLY_EDIT
+        return _TRANSACTION_READONLY_NEW
 
 
 class Charge(AbstractTransaction):
@@ -791,12 +994,23 @@ class Charge(AbstractTransaction):
         blank=True,
         null=False,
         verbose_name=ugettext_lazy('Conciliated'))
+    refunded = models.BooleanField(
+        default=False,
+        blank=True,
+        null=False,
+        verbose_name=ugettext_lazy('Refunded'))
+
+    op_fill_fields = ('authorization', 'operation_type', 'transaction_type',
+                      'status', 'conciliated', 'operation_date',
+                      'description', 'error_message', 'order_id', 'amount',
+                      'method', 'currency', 'creation_date', 'subscription',
+                      'customer', 'card')
 
     @classmethod
     def get_readonly_fields(self, instance=None):
         if instance:
-            return ['conciliated', ] + super().get_readonly_fields(instance)
-        return ['conciliated', ] + super().get_readonly_fields(instance)
+            return _CHARGE_READONLY_EDIT
+        return _CHARGE_READONLY_NEW
 
     def op_capture(self):
         if not self.openpay_id:
@@ -804,19 +1018,22 @@ class Charge(AbstractTransaction):
         if self.method != hardcode.transaction_method_card:
             raise exceptions.OpenpayNoCard
 
-        if not hasattr(self, '_op_'):
-            self.op_load()
         self._op_.capture()
 
-    def op_refund(self, amount=None):
+    def op_refund(self, amount=None, save=True):
         if not self.openpay_id:
             raise exceptions.OpenpayObjectDoesNotExist
         if self.method != hardcode.transaction_method_card:
             raise exceptions.OpenpayNoCard
 
-        if not hasattr(self, '_op_'):
-            self.op_load()
-        self._op_.refund(amount) if amount else self._op_.refund()
+        self._op_.refund(amount=amount) if amount else self._op_.refund()
+        # Partial refunds leave the charge as not refunded
+        if amount and Decimal(amount) < self.amount:
+            return
+        self.refunded = True
+        if save:
+            # The refund is already in Openpay, there is nothing to commit
+            Charge.objects.filter(pk=self.pk).update(refunded=True)
 
     def op_commit(self):
         if not self.openpay_id:
@@ -854,14 +1071,12 @@ class Charge(AbstractTransaction):
             raise exceptions.OpenpayObjectDoesNotExist
 
     def op_fill(self):
-        if not hasattr(self, '_op_'):
-            self.op_load()
         self.authorization = self._op_.authorization
         self.operation_type = self._op_.operation_type
         self.transaction_type = self._op_.transaction_type
         self.status = self._op_.status
         self.conciliated = self._op_.conciliated
-        self.operation_date = parse_datetime(
+        self.operation_date = parse_openpay_datetime(
             self._op_.operation_date)
         self.description = self._op_.description
         self.error_message = self._op_.error_message
@@ -869,7 +1084,7 @@ class Charge(AbstractTransaction):
         self.amount = Decimal(self._op_.amount)
         self.method = self._op_.method
         self.currency = self._op_.currency
-        self.creation_date = parse_datetime(
+        self.creation_date = parse_openpay_datetime(
             self._op_.creation_date)
         if hasattr(self._op_, 'subscription_id'):
             self.subscription = Subscription.objects.get(
@@ -883,6 +1098,7 @@ class Charge(AbstractTransaction):
             if not self.customer and hasattr(self._op_.card, 'customer_id'):
                 self.customer = get_customer_model().objects.get(
                     openpay_id=self._op_.card.customer_id)
+        return self.op_fill_fields
 
     def op_dismiss(self):
         raise NotImplementedError
@@ -893,11 +1109,17 @@ class Charge(AbstractTransaction):
 
 @receiver(pre_save, sender=Charge)
 @skippable
+@validated
 def charge_presave(sender, instance=None, **kwargs):
-    instance.full_clean()
     if instance.card.customer_id != instance.customer_id:
         raise exceptions.OpenpayNotUserCard
-    instance.op_commit()
+    instance.op_commit_on_save()
+
+
+@receiver(post_save, sender=Charge)
+@skippable
+def charge_postsave(sender, instance, **kwargs):
+    instance.op_commit_after_save()
 
 
 # This WILL FAIL. And that is the point: to prevent the deletion of charges
@@ -922,10 +1144,8 @@ class Refund(AbstractTransaction):
     @classmethod
     def get_readonly_fields(self, instance=None):
         if instance:
-            return ['charge', 'conciliated', ] + \
-                super().get_readonly_fields(instance)
-        return ['charge', 'conciliated', ] + \
-            super().get_readonly_fields(instance)
+            return _REFUND_READONLY_EDIT
+        return _REFUND_READONLY_NEW
 
     def __str__(self):
         return self.openpay_id
@@ -1,5 +1,7 @@
+from django.apps import apps
 from django.db.models import Q
 
+from celery import shared_task
 from celery.decorators import periodic_task
 from celery.task.schedules import crontab
 from celery.utils.log import get_task_logger
@@ -21,10 +23,40 @@ def updateSubscriptions():
     subscriptions_in_system = models.Subscription.objects.filter(
         Q(charge_date__gte=datetime.now().date()) | Q(charge_date=None)
     ).exclude(
-        status=hardcode.subscription_status_cancelled)
+        status=hardcode.subscription_status_cancelled
+    ).select_related('customer', 'card')
 
     if subscriptions_in_system.exists():
         for subscription in subscriptions_in_system.iterator():
             subscription.op_refresh(save=True)
 
     logger.info("System subscriptions up to date with Openpay's servers.")
+
+
+@shared_task(name="commitOpenpayObject", ignore_result=True)
+def commitOpenpayObject(app_label, model_name, pk):
+    instance = apps.get_model(app_label, model_name).objects.get(pk=pk)
+    # The stored values are the ones to commit, even though they match the
+    # snapshot taken when the instance was loaded
+    instance.force_commit = True
+    instance.op_commit()
+    instance.skip_signal = True
+    instance.save(update_fields=instance.op_fill_fields)
+
+
+@shared_task(name="captureCharge", ignore_result=True)
+def captureCharge(pk):
+    charge = models.Charge.objects.select_related('customer').get(pk=pk)
+    charge.op_capture()
+    charge.op_fill()
+    charge.skip_signal = True
+    charge.save(update_fields=charge.op_fill_fields)
+
+
+@shared_task(name="refundCharge", ignore_result=True)
+def refundCharge(pk):
+    charge = models.Charge.objects.select_related('customer').get(pk=pk)
+    charge.op_refund(save=False)
+    charge.op_fill()
+    charge.skip_signal = True
+    charge.save(update_fields=charge.op_fill_fields + ('refunded', ))
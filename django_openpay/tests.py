@@ -1,3 +1,225 @@
 from django.test import TestCase
+from django.utils import timezone
 
-# Create your tests here.
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from . import hardcode, models, utils
+
+
+class OpBulkSaveTests(TestCase):
+    def create_plan(self, name):
+        plan = models.Plan(
+            name=name,
+            amount=Decimal('10.00'),
+            creation_date=timezone.now())
+        plan.skip_signal = True
+        plan.save()
+        return plan
+
+    def test_saves_the_values_of_each_instance(self):
+        plans = [self.create_plan('Plan %d' % i) for i in range(3)]
+        for i, plan in enumerate(plans):
+            plan.name = 'Renamed %d' % i
+            plan.amount = Decimal(i)
+            plan.trial_days = i
+
+        # A batch smaller than the instances runs more than one UPDATE
+        models.Plan.op_bulk_save(plans, ('name', 'amount'), batch_size=2)
+
+        for i, plan in enumerate(plans):
+            stored = models.Plan.objects.get(pk=plan.pk)
+            self.assertEqual(stored.name, 'Renamed %d' % i)
+            self.assertEqual(stored.amount, Decimal(i))
+            # Only the given fields are saved
+            self.assertEqual(stored.trial_days, 0)
+
+    def test_splits_the_batches_by_the_query_parameters(self):
+        # Enough rows and fields to exceed the parameters of a single query
+        # in every database (999 in SQLite)
+        plans = [self.create_plan('Plan %d' % i) for i in range(100)]
+        for i, plan in enumerate(plans):
+            plan.name = 'Renamed %d' % i
+            plan.retry_times = i
+
+        models.Plan.op_bulk_save(plans, models.Plan.op_fill_fields)
+
+        for i, plan in enumerate(plans):
+            stored = models.Plan.objects.get(pk=plan.pk)
+            self.assertEqual(stored.name, 'Renamed %d' % i)
+            self.assertEqual(stored.retry_times, i)
+
+    def test_ignores_unsaved_instances(self):
+        plan = models.Plan(
+            name='Unsaved',
+            amount=Decimal('10.00'),
+            creation_date=timezone.now())
+        models.Plan.op_bulk_save([plan], ('name', ))
+        self.assertFalse(models.Plan.objects.exists())
+
+
+class ChargeRefundTests(TestCase):
+    def create_charge(self):
+        charge = models.Charge(
+            openpay_id='charge',
+            method=hardcode.transaction_method_card,
+            amount=Decimal('100.00'))
+        charge._op_ = mock.Mock()
+        return charge
+
+    def test_full_refund(self):
+        charge = self.create_charge()
+        charge.op_refund(save=False)
+        charge._op_.refund.assert_called_once_with()
+        self.assertTrue(charge.refunded)
+
+    def test_partial_refund(self):
+        charge = self.create_charge()
+        charge.op_refund(amount=Decimal('40.00'), save=False)
+        charge._op_.refund.assert_called_once_with(amount=Decimal('40.00'))
+        # Partial refunds leave the charge as not refunded
+        self.assertFalse(charge.refunded)
+
+    def test_refund_of_the_whole_amount(self):
+        charge = self.create_charge()
+        charge.op_refund(amount=Decimal('100.00'), save=False)
+        charge._op_.refund.assert_called_once_with(amount=Decimal('100.00'))
+        self.assertTrue(charge.refunded)
+
+
+def op_object(**attrs):
+    # A fake Openpay object with the given attributes ('name' cannot be
+    # passed to the Mock constructor)
+    obj = mock.Mock()
+    for attr, value in attrs.items():
+        setattr(obj, attr, value)
+    return obj
+
+
+@mock.patch.object(models, 'openpay')
+class OpCommitTests(TestCase):
+    creation_date = '2017-01-01T00:00:00Z'
+
+    def create_plan(self):
+        plan = models.Plan(
+            openpay_id='plan',
+            name='Plan',
+            amount=Decimal('10.00'),
+            creation_date=timezone.now())
+        plan.skip_signal = True
+        plan.save()
+        return models.Plan.objects.get(pk=plan.pk)
+
+    def op_plan(self, plan):
+        return op_object(
+            id=plan.openpay_id,
+            name=plan.name,
+            amount=str(plan.amount),
+            status_after_retry=plan.status_after_retry,
+            retry_times=plan.retry_times,
+            repeat_unit=plan.repeat_unit,
+            trial_days=plan.trial_days,
+            repeat_every=plan.repeat_every,
+            creation_date=self.creation_date)
+
+    def test_unchanged_object_is_not_committed(self, openpay):
+        plan = self.create_plan()
+        plan.save()
+        openpay.Plan.retrieve.assert_not_called()
+
+    def test_untracked_change_is_not_committed(self, openpay):
+        plan = self.create_plan()
+        plan.description = 'Only stored here'
+        plan.save()
+        openpay.Plan.retrieve.assert_not_called()
+
+    def test_tracked_change_is_committed(self, openpay):
+        plan = self.create_plan()
+        openpay.Plan.retrieve.return_value = self.op_plan(plan)
+        plan.name = 'Renamed'
+        plan.save()
+
+        openpay.Plan.retrieve.assert_called_once_with('plan')
+        op_plan = openpay.Plan.retrieve.return_value
+        op_plan.save.assert_called_once_with()
+        self.assertEqual(op_plan.name, 'Renamed')
+        self.assertEqual(
+            models.Plan.objects.get(pk=plan.pk).name, 'Renamed')
+
+        # Saving it again has nothing new to commit
+        plan.save()
+        op_plan.save.assert_called_once_with()
+
+    def test_address_change_commits_its_customers(self, openpay):
+        address = models.Address(
+            city='Guadalajara',
+            state='Jalisco',
+            line1='Av. Vallarta 1',
+            postal_code=44100)
+        address.save()
+        customer = models.get_customer_model()(
+            openpay_id='customer',
+            first_name='Juan',
+            email='juan@example.com',
+            address=address,
+            creation_date=timezone.now())
+        customer.skip_signal = True
+        customer.save()
+        openpay.Customer.retrieve.return_value = op_object(
+            id='customer',
+            name='Juan',
+            last_name=None,
+            email='juan@example.com',
+            phone_number=None,
+            creation_date=self.creation_date)
+
+        # The customers only track the address_id, not the address contents
+        address = models.Address.objects.get(pk=address.pk)
+        address.city = 'Zapopan'
+        address.save()
+
+        openpay.Customer.retrieve.assert_called_once_with('customer')
+        op_customer = openpay.Customer.retrieve.return_value
+        op_customer.save.assert_called_once_with()
+        self.assertEqual(op_customer.address['city'], 'Zapopan')
+
+
+class ParseOpenpayDateTests(TestCase):
+    def test_empty_datetime(self):
+        self.assertIsNone(utils.parse_openpay_datetime(None))
+        self.assertIsNone(utils.parse_openpay_datetime(''))
+
+    def test_datetime(self):
+        self.assertEqual(
+            utils.parse_openpay_datetime('2017-01-02T03:04:05Z'),
+            datetime(2017, 1, 2, 3, 4, 5, tzinfo=timezone.utc))
+        self.assertEqual(
+            utils.parse_openpay_datetime('2017-01-02T03:04:05-06:00'),
+            datetime(2017, 1, 2, 9, 4, 5, tzinfo=timezone.utc))
+
+    def test_datetime_fallback(self):
+        # Values that fromisoformat rejects (or its absence before Python
+        # 3.7) are parsed with parse_datetime
+        fake_datetime = mock.Mock()
+        fake_datetime.fromisoformat.side_effect = ValueError
+        with mock.patch.object(utils, 'datetime', fake_datetime):
+            value = utils.parse_openpay_datetime('2017-01-02T03:04:05Z')
+        self.assertEqual(
+            value, datetime(2017, 1, 2, 3, 4, 5, tzinfo=timezone.utc))
+        self.assertEqual(value.utcoffset(), timedelta(0))
+
+    def test_empty_date(self):
+        self.assertIsNone(utils.parse_openpay_date(None))
+        self.assertIsNone(utils.parse_openpay_date(''))
+
+    def test_date(self):
+        self.assertEqual(
+            utils.parse_openpay_date('2017-01-02'), date(2017, 1, 2))
+
+    def test_date_fallback(self):
+        fake_date = mock.Mock()
+        fake_date.fromisoformat.side_effect = ValueError
+        with mock.patch.object(utils, 'date', fake_date):
+            value = utils.parse_openpay_date('2017-01-02')
+        self.assertEqual(value, date(2017, 1, 2))
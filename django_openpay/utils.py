@@ -4,17 +4,22 @@ from django.apps import apps as django_apps
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.http import HttpResponse
+from django.utils.dateparse import parse_datetime, parse_date
 
 import base64
 import binascii
+from datetime import date, datetime
+from functools import lru_cache
 from urllib.parse import unquote_plus
 
 from . import ugettext_lazy
 
 
+@lru_cache(maxsize=1)
 def get_customer_model():
     """
-    Returns the Customer model that is active in this project.
+    Returns the Customer model that is active in this project. The result is
+    cached, the setting cannot change while the project is running.
     """
     try:
         return django_apps.get_model(settings.OPENPAY_CUSTOMER_MODEL)
@@ -29,6 +34,36 @@ def get_customer_model():
         )
 
 
+def parse_openpay_datetime(value):
+    """
+    Parses the ISO 8601 datetimes sent by Openpay. datetime.fromisoformat
+    (Python 3.7+) is tried first, it is much faster than the regex of
+    parse_datetime, which is still used as a fallback.
+    """
+    if not value:
+        return None
+    if hasattr(datetime, 'fromisoformat'):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            pass
+    return parse_datetime(value)
+
+
+def parse_openpay_date(value):
+    """
+    Parses the ISO 8601 dates sent by Openpay, like parse_openpay_datetime.
+    """
+    if not value:
+        return None
+    if hasattr(date, 'fromisoformat'):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    return parse_date(value)
+
+
 class HttpResponseUnauthorized(HttpResponse):
     status_code = 401
 
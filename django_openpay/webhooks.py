@@ -1,6 +1,7 @@
-from django.utils.dateparse import parse_datetime, parse_date
+from decimal import Decimal
 
 from . import models
+from .utils import parse_openpay_datetime
 
 
 def verification(body):
@@ -24,25 +25,31 @@ def chargeRefunded(body):
         if not customer and 'customer_id' in transaction['card']:
             customer = models.get_customer_model().objects.get(
                 openpay_id=transaction['card']['customer_id'])
+    charge_defaults = {
+        'authorization': transaction['authorization'],
+        'method': transaction['method'],
+        'operation_type': transaction['operation_type'],
+        'transaction_type': transaction['transaction_type'],
+        'status': transaction['status'],
+        'conciliated': transaction['conciliated'],
+        'creation_date': parse_openpay_datetime(
+            transaction['creation_date']),
+        'operation_date': parse_openpay_datetime(
+            transaction['operation_date']),
+        'description': transaction['description'],
+        'error_message': transaction['error_message'],
+        'order_id': transaction['order_id'],
+        'amount': transaction['amount'],
+        'currency': transaction['currency'],
+        'customer': customer,
+        'card': card,
+    }
+    # Partial refunds leave the charge as not refunded
+    if Decimal(str(transaction['refund']['amount'])) >= \
+            Decimal(str(transaction['amount'])):
+        charge_defaults['refunded'] = True
     charge, created = models.Charge.objects.update_or_create(
-        openpay_id=transaction['id'],
-        defaults={
-            'authorization': transaction['authorization'],
-            'method': transaction['method'],
-            'operation_type': transaction['operation_type'],
-            'transaction_type': transaction['transaction_type'],
-            'status': transaction['status'],
-            'conciliated': transaction['conciliated'],
-            'creation_date': parse_datetime(transaction['creation_date']),
-            'operation_date': parse_datetime(transaction['operation_date']),
-            'description': transaction['description'],
-            'error_message': transaction['error_message'],
-            'order_id': transaction['order_id'],
-            'amount': transaction['amount'],
-            'currency': transaction['currency'],
-            'customer': customer,
-            'card': card,
-        })
+        openpay_id=transaction['id'], defaults=charge_defaults)
 
     transaction = transaction['refund']
     refund, created = models.Refund.objects.update_or_create(
@@ -54,8 +61,10 @@ def chargeRefunded(body):
             'transaction_type': transaction['transaction_type'],
             'status': transaction['status'],
             'conciliated': transaction['conciliated'],
-            'creation_date': parse_datetime(transaction['creation_date']),
-            'operation_date': parse_datetime(transaction['operation_date']),
+            'creation_date': parse_openpay_datetime(
+                transaction['creation_date']),
+            'operation_date': parse_openpay_datetime(
+                transaction['operation_date']),
             'description': transaction['description'],
             'error_message': transaction['error_message'],
             'order_id': transaction['order_id'],
@@ -92,8 +101,10 @@ def chargeCancelled(body):
             'transaction_type': transaction['transaction_type'],
             'status': transaction['status'],
             'conciliated': transaction['conciliated'],
-            'creation_date': parse_datetime(transaction['creation_date']),
-            'operation_date': parse_datetime(transaction['operation_date']),
+            'creation_date': parse_openpay_datetime(
+                transaction['creation_date']),
+            'operation_date': parse_openpay_datetime(
+                transaction['operation_date']),
             'description': transaction['description'],
             'error_message': transaction['error_message'],
             'order_id': transaction['order_id'],
@@ -131,8 +142,10 @@ def chargeCreated(body):
             'transaction_type': transaction['transaction_type'],
             'status': transaction['status'],
             'conciliated': transaction['conciliated'],
-            'creation_date': parse_datetime(transaction['creation_date']),
-            'operation_date': parse_datetime(transaction['operation_date']),
+            'creation_date': parse_openpay_datetime(
+                transaction['creation_date']),
+            'operation_date': parse_openpay_datetime(
+                transaction['operation_date']),
             'description': transaction['description'],
             'error_message': transaction['error_message'],
             'order_id': transaction['order_id'],
@@ -170,8 +183,10 @@ def chargeSucceeded(body):
             'transaction_type': transaction['transaction_type'],
             'status': transaction['status'],
             'conciliated': transaction['conciliated'],
-            'creation_date': parse_datetime(transaction['creation_date']),
-            'operation_date': parse_datetime(transaction['operation_date']),
+            'creation_date': parse_openpay_datetime(
+                transaction['creation_date']),
+            'operation_date': parse_openpay_datetime(
+                transaction['operation_date']),
             'description': transaction['description'],
             'error_message': transaction['error_message'],
             'order_id': transaction['order_id'],